@@ -0,0 +1,121 @@
+# cython: language_level=3
+"""
+Compiled consolidation kernel for cli_consolidatedcanonical.py
+
+This optional extension module implements consolidate_content_items() with typed
+locals, so that the per-content-item dictionary work runs without interpreter
+dispatch. It is used by cli_consolidatedcanonical.py when it has been built with
+`make build-ext`; otherwise the pure Python implementation is used.
+
+The behaviour must stay identical to _consolidate_content_item() and
+consolidate_content_items() in cli_consolidatedcanonical.py.
+"""
+
+cdef object _MISSING = object()
+
+# OPTIONAL_CI_FIELDS of cli_consolidatedcanonical.py
+cdef tuple OPTIONAL_CI_FIELDS = ("t", "iiif_link", "var_t", "archival_note")
+
+# logging.DEBUG
+cdef int DEBUG = 10
+
+
+cpdef tuple consolidate_content_items(
+    list content_items,
+    object enrichments,
+    str langident_run_id,
+    object log,
+    object error,
+):
+    """
+    Consolidate the content items of an issue in place.
+
+    Args:
+        content_items: Content items of the issue (`i` field)
+        enrichments: EnrichmentIndex holding the enrichments of the issue
+        langident_run_id: Run ID for langident provenance
+        log: Logger of the calling module
+        error: Exception class raised for content items without `id`
+
+    Returns:
+        tuple: Number of consolidated and of skipped content items, and the type
+        of the first article or page content item (None if there is none)
+    """
+    cdef dict rows = enrichments.rows
+    cdef list lgs = enrichments.lg
+    # Lists, or typed arrays after EnrichmentIndex.compact()
+    cdef object ocrqas = enrichments.ocrqa
+    cdef object char_lens = enrichments.char_len
+    cdef bint debug = log.isEnabledFor(DEBUG)
+    cdef Py_ssize_t processed_count = 0
+    cdef Py_ssize_t skipped_count = 0
+    cdef dict ci_metadata
+    cdef object ci, ci_id, ci_type, value, lg_original, row
+    cdef object first_type = None
+    cdef str field
+    # Row of the content item in the enrichment columns. Bounds checking stays
+    # on, so an inconsistent EnrichmentIndex raises IndexError
+    cdef Py_ssize_t index
+
+    for ci in content_items:
+        ci_metadata = ci.get("m")
+        if not ci_metadata:
+            continue
+
+        ci_id = ci_metadata.get("id")
+        if not ci_id:
+            raise error("Content item missing 'id' field")
+
+        for field in OPTIONAL_CI_FIELDS:
+            value = ci_metadata.get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            if value is None or (isinstance(value, str) and not value.strip()):
+                if debug:
+                    log.debug(
+                        "Removing field '%s' with None/empty value from content"
+                        " item %s",
+                        field,
+                        ci_id,
+                    )
+                del ci_metadata[field]
+
+        lg_original = ci_metadata.pop("lg", _MISSING)
+        if lg_original is not _MISSING:
+            ci_metadata["lg_original"] = lg_original
+            if debug:
+                log.debug("Renamed lg → lg_original for %s", ci_id)
+        else:
+            lg_original = ci_metadata.pop("l", _MISSING)
+            if lg_original is not _MISSING:
+                ci_metadata["lg_original"] = lg_original
+                if debug:
+                    log.debug("Renamed l → lg_original for %s", ci_id)
+
+        ci_type = ci_metadata.get("tp")
+        if first_type is None and (ci_type == "article" or ci_type == "page"):
+            first_type = ci_type
+        if ci_type == "image":
+            if debug:
+                log.debug("Skipping consolidation for image content item: %s", ci_id)
+        else:
+            row = rows.get(ci_id)
+            if row is None:
+                log.warning(
+                    "Missing enrichment data for content item: %s (type: %s). "
+                    "Skipping consolidation for this item.",
+                    ci_id,
+                    ci_type,
+                )
+            else:
+                index = row
+                ci_metadata["consolidated_lg"] = lgs[index]
+                ci_metadata["consolidated_ocrqa"] = ocrqas[index]
+                ci_metadata["consolidated_char_len"] = char_lens[index]
+                ci_metadata["consolidated_langident_run_id"] = langident_run_id
+                processed_count += 1
+                continue
+
+        skipped_count += 1
+
+    return processed_count, skipped_count, first_type
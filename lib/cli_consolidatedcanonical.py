@@ -55,107 +55,1592 @@ Note:
 
 import logging
 import argparse
+import array
+import collections
+import contextlib
+import functools
+import gc
+import hashlib
+import io
+import itertools
 import json
+import mmap
+import multiprocessing
+import os
+import pathlib
+import sqlite3
+import stat
 import sys
-from typing import Dict, List, Optional, Any
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    Any,
+    cast,
+)
 from smart_open import open as smart_open  # type: ignore
+from smart_open.compression import (  # type: ignore
+    compression_wrapper,
+    get_supported_extensions,
+)
 import jsonschema
 from jsonschema import Draft7Validator
 import re
 from datetime import datetime
 
-from impresso_cookbook import (  # type: ignore
-    get_s3_client,
-    get_timestamp,
-    setup_logging,
-    get_transport_params,
-)
+from impresso_cookbook import (  # type: ignore
+    get_s3_client,
+    get_timestamp,
+    setup_logging,
+    get_transport_params,
+)
+
+# Optional modules are None when not installed
+orjson: Any
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the standard library
+    orjson = None
+
+try:
+    import fastjsonschema  # type: ignore
+except ImportError:  # pragma: no cover - validate with jsonschema only
+    fastjsonschema = None
+
+msgspec: Any
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - fall back to the standard library
+    msgspec = None
+
+try:
+    # Optional compiled consolidation kernel, built with `make build-ext`
+    import _consolidatedcanonical  # type: ignore
+except ImportError:
+    _consolidatedcanonical = None
+
+log = logging.getLogger(__name__)
+
+SCHEMA_BASE_URI = "https://impresso.github.io/impresso-schemas/json/canonical/"
+IMPRESSO_SCHEMA = "issue.schema.json"
+
+# Downloaded schemas are cached on disk for a day: many consolidation runs start in
+# parallel and would otherwise all fetch the same schema over HTTP
+SCHEMA_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "impresso-consolidatedcanonical",
+    "schemas",
+)
+SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+# Buffer of the BufferedReader around S3RangeReader: S3 inputs are read in blocks
+# as large as one range request instead of io's default 8 KiB
+S3_READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Parallel range GETs for the S3 inputs: a single S3 connection is throttled
+# well below the available bandwidth, so the object is fetched in chunks by
+# several concurrent requests and reassembled in order
+S3_RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+S3_RANGE_WORKERS = 8
+
+# Number of canonical lines sent to a worker process per task when --workers > 1
+WORKER_CHUNKSIZE = 64
+
+# Size of the blocks read from the (decompressed) input streams before splitting
+# them into lines
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Consolidated issues are collected into blocks of at least this size before
+# being written to the output stream
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# Blocks read ahead from the input streams and blocks queued for writing to the
+# output stream by background threads, so that fetching, decompression and
+# uploads overlap with consolidation
+READ_AHEAD_BLOCKS = 8
+WRITE_BEHIND_BLOCKS = 8
+
+# Part size of S3 multipart uploads for the output: fewer, larger UploadPart
+# requests than smart_open's default of 50 MiB
+S3_MIN_PART_SIZE = 64 * 1024 * 1024
+
+# Ways of joining the enrichments with the canonical issues (--enrichment-backend):
+# an in-memory hash index, a merge join of sorted inputs, or an on-disk sqlite
+# database for enrichment files too large to be held in memory
+ENRICHMENT_BACKENDS = ("dict", "sorted-merge", "sqlite")
+
+# Number of enrichment records inserted per executemany() call into the sqlite store
+SQLITE_INSERT_BATCH_SIZE = 10000
+
+# Timestamps already in the target format (as an anchored match, "$" also accepts
+# a trailing newline)
+ISO8601_Z_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+
+# 'YYYY-MM-DD HH:MM:SS' and 'YYYY-MM-DDTHH:MM:SS' with ASCII digits, converted by
+# _join_iso8601_z()
+ISO8601_NAIVE_PATTERN = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}[T ][0-9]{2}:[0-9]{2}:[0-9]{2}"
+)
+
+# Default for dict.pop() to tell an absent key from a key holding None
+_MISSING = object()
+
+# Shared default for the content items of an issue without `i`
+_EMPTY: Tuple[Any, ...] = ()
+
+# Optional string fields of content item metadata, removed when None or blank.
+# A tuple: probing these few keys beats intersecting a set with the item's keys
+OPTIONAL_CI_FIELDS = ("t", "iiif_link", "var_t", "archival_note")
+
+# Optional issue fields, removed when None or (for strings) blank
+OPTIONAL_ISSUE_FIELDS = (
+    "s",  # text styles (array)
+    "n",  # notes (string or array)
+    "media_title_variant",  # string
+    "iiif_manifest_uri",  # string
+    "rc",  # radio channel (string)
+    "rp",  # radio program (string)
+)
+
+
+class ConsolidationError(RuntimeError):
+    """
+    Raised when the inputs cannot be consolidated (malformed or inconsistent data).
+    """
+
+
+# Parser for raw JSON bytes (surrounding whitespace is ignored): msgspec if available,
+# else the standard library. orjson is only used for writing, as it silently parses
+# integers beyond the 64-bit range into floats, whereas msgspec keeps them exact.
+# Bound directly rather than wrapped so that each call goes straight to C.
+json_loads: Callable[[bytes], Any] = (
+    msgspec.json.decode if msgspec is not None else json.loads
+)
+
+# Errors raised by json_loads() and the enrichment decoder for invalid JSON
+_JSON_DECODE_ERRORS: Tuple[Type[BaseException], ...] = (json.JSONDecodeError,)
+if msgspec is not None:
+    _JSON_DECODE_ERRORS += (msgspec.DecodeError,)
+
+# Encoder for json_dumps_line() when msgspec is the best library available
+_json_encoder = msgspec.json.Encoder() if msgspec is not None else None
+
+
+def json_loads_stdlib(line: bytes, description: str) -> Any:
+    """
+    Parse a line rejected by json_loads() (or the enrichment decoder) with the
+    standard library.
+
+    msgspec rejects the NaN, Infinity and -Infinity literals, which json.dumps()
+    writes by default and json.loads() accepts, so lines holding them are retried
+    here before they count as invalid.
+
+    Args:
+        line: Raw JSON line
+        description: Where the line comes from, for the error message (e.g.
+            "canonical line 3")
+
+    Returns:
+        Any: Parsed JSON value
+
+    Raises:
+        ConsolidationError: If the standard library cannot parse the line either
+    """
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ConsolidationError(f"Invalid JSON in {description}: {e}") from None
+
+
+def parse_json_line(line: bytes, description: str) -> Tuple[Any, bool]:
+    """
+    Parse a JSON line with json_loads(), or json_loads_stdlib() if it rejects it.
+
+    Parsed values are exactly those of json.loads(), including integers beyond
+    the 64-bit range and non-finite floats:
+
+    >>> parse_json_line(b'{"ocrqa": NaN}', "line 1")[0]
+    {'ocrqa': nan}
+    >>> parse_json_line(b'{"big": 123456789012345678901234567890}', "line 1")[0]
+    {'big': 123456789012345678901234567890}
+
+    Args:
+        line: Raw JSON line
+        description: Where the line comes from, for the error message
+
+    Returns:
+        Tuple[Any, bool]: Parsed value, and whether the standard library parsed
+        it, in which case it may hold non-finite floats and should be written
+        back with json_dumps_line(..., stdlib=True)
+
+    Raises:
+        ConsolidationError: If the line is not valid JSON
+    """
+    try:
+        return json_loads(line), json_loads is json.loads
+    except _JSON_DECODE_ERRORS:
+        return json_loads_stdlib(line, description), True
+
+
+def json_dumps_line(obj: Any, stdlib: bool = False) -> bytes:
+    """
+    Serialize an object to a single newline-terminated JSON Lines record.
+
+    With orjson or msgspec the newline is appended by the encoder itself, which
+    saves concatenating (and thereby copying) the serialized issue once more.
+    Both write non-finite floats (NaN, Infinity) as null, whereas the standard
+    library writes them as is. Objects orjson cannot write, such as integers
+    beyond the 64-bit range, are passed on to msgspec or the standard library:
+
+    >>> json.loads(json_dumps_line({"big": 123456789012345678901234567890}))
+    {'big': 123456789012345678901234567890}
+    >>> json_dumps_line({"ocrqa": float("nan")}, stdlib=True)
+    b'{"ocrqa": NaN}\\n'
+
+    Args:
+        obj: JSON-serializable object
+        stdlib: Serialize with the standard library, e.g. for an issue that was
+            parsed by json_loads_stdlib() and may hold non-finite floats
+
+    Returns:
+        bytes: Compact UTF-8 encoded JSON followed by a newline
+    """
+    if not stdlib:
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+            except TypeError:  # orjson.JSONEncodeError
+                pass
+        if _json_encoder is not None:
+            return _json_encoder.encode_lines((obj,))
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+if msgspec is not None:
+
+    class EnrichmentRecord(msgspec.Struct):
+        """
+        Enrichment fields used for consolidation, decoded directly by msgspec.
+
+        All other fields of an enrichment line are skipped while decoding instead
+        of being materialized in a dictionary. Values are not type-checked so that
+        they are passed through exactly as with a plain JSON parser.
+        """
+
+        id: Any = None
+        lg: Any = None
+        ocrqa: Any = None
+        len: Any = None
+
+    _enrichment_decoder: Any = msgspec.json.Decoder(EnrichmentRecord)
+else:
+    _enrichment_decoder = None
+
+
+class SchemaValidator:
+    """
+    Draft 7 schema validator with a compiled fast path.
+
+    When fastjsonschema is installed, the schema is compiled into a specialized
+    Python function that checks valid issues much faster than jsonschema walks the
+    schema. Issues it rejects are validated again with Draft7Validator, which
+    decides and raises jsonschema.ValidationError for the detailed diagnostics.
+    """
+
+    def __init__(self, schema_dict: Dict[str, Any]) -> None:
+        self._setup(schema_dict)
+
+    def _setup(self, schema_dict: Dict[str, Any]) -> None:
+        self.schema_dict = schema_dict
+        # Directly create the validator without a registry or a resolver
+        self.validator = Draft7Validator(schema_dict)
+        self._compiled: Optional[Callable[[Any], Any]] = None
+        if fastjsonschema is not None:
+            try:
+                # use_default=False: the checked issue must not be modified
+                self._compiled = fastjsonschema.compile(schema_dict, use_default=False)
+            except Exception as e:
+                log.warning("Cannot compile schema, using jsonschema only: %s", e)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled function cannot be pickled: compile again when unpickled
+        return {"schema_dict": self.schema_dict}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._setup(state["schema_dict"])
+
+    def validate(self, instance: Any) -> None:
+        """
+        Validate an instance against the schema.
+
+        Raises:
+            jsonschema.ValidationError: If the instance is invalid
+        """
+        if self._compiled is not None:
+            try:
+                self._compiled(instance)
+                return
+            except fastjsonschema.JsonSchemaException:
+                pass
+        self.validator.validate(instance)
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(uri: str) -> Dict[str, Any]:
+    """
+    Load a JSON schema, caching it in SCHEMA_CACHE_DIR for SCHEMA_CACHE_TTL.
+
+    Args:
+        uri: URI of the schema
+
+    Returns:
+        Dict[str, Any]: The schema (shared between calls: do not modify)
+    """
+    cache_path = os.path.join(
+        SCHEMA_CACHE_DIR, hashlib.sha1(uri.encode("utf-8")).hexdigest() + ".json"
+    )
+    try:
+        if time.time() - os.path.getmtime(cache_path) < SCHEMA_CACHE_TTL:
+            with open(cache_path, "rb") as f:
+                return json.loads(f.read())
+    except (OSError, ValueError):
+        pass  # Missing, unreadable or corrupt cache entry: fetch again
+
+    with smart_open(uri, "rb") as f:
+        data = f.read()
+    schema = json.loads(data)
+
+    # Write to a temporary file and rename it, so that parallel runs never read
+    # a partially written cache entry
+    try:
+        os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=SCHEMA_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.debug("Cannot cache schema %s: %s", uri, e)
+    return schema
+
+
+def initialize_validator(
+    schema_base_uri: str = SCHEMA_BASE_URI, schema: str = IMPRESSO_SCHEMA
+) -> SchemaValidator:
+    """
+    Initializes the schema validator.
+
+    Args:
+        schema_base_uri: Base URI for the schema
+        schema: Schema filename
+
+    Returns:
+        SchemaValidator: Configured validator instance
+    """
+    return SchemaValidator(load_schema(schema_base_uri + schema))
+
+
+def iter_lines(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Yield the lines of a binary stream read in large blocks (see ReadAhead).
+
+    Splitting big blocks on newlines avoids the per-line buffering of the file
+    object's own line iterator.
+
+    Args:
+        blocks: Consecutive blocks of the binary input stream
+
+    Yields:
+        bytes: Lines without the trailing newline
+    """
+    tail = b""
+    for chunk in blocks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def is_mappable(path: str, f: IO[bytes]) -> bool:
+    """
+    Whether an input stream is a regular local file read as is (without
+    decompression), which can be memory-mapped instead of being read in blocks.
+
+    Named pipes, /dev/stdin or process substitutions are local paths too, but
+    they report a size of 0 and cannot be mapped.
+
+    Args:
+        path: Path the stream was opened from
+        f: Open binary input stream
+    """
+    if "://" in path or os.path.splitext(path)[1] in get_supported_extensions():
+        return False
+    try:
+        return stat.S_ISREG(os.fstat(f.fileno()).st_mode)
+    except (AttributeError, OSError):
+        return False
+
+
+def iter_mapped_lines(f: IO[bytes]) -> Generator[bytes, None, None]:
+    """
+    Yield the lines of a local uncompressed file through a memory map.
+
+    Each line is copied once, straight out of the page cache, instead of being
+    read into a block, joined with the tail of the previous block and split.
+
+    Args:
+        f: Binary stream of a regular local file opened without decompression
+
+    Yields:
+        bytes: Lines without the trailing newline
+    """
+    size = os.fstat(f.fileno()).st_size
+    if not size:
+        return  # Empty files cannot be mapped
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        find = mm.find
+        start = 0
+        while start < size:
+            end = find(b"\n", start)
+            if end < 0:
+                end = size
+            yield mm[start:end]
+            start = end + 1
+
+
+def enter_input_lines(
+    stack: contextlib.ExitStack, f: IO[bytes], path: str
+) -> Iterator[bytes]:
+    """
+    Returns the lines of an open input stream, registering their cleanup on stack.
+
+    Regular local uncompressed files are memory-mapped (see iter_mapped_lines()); other
+    streams are read in blocks by a background thread (see ReadAhead). Enter this
+    after the stream itself, so the lines are released before it is closed.
+
+    Args:
+        stack: ExitStack holding the input stream
+        f: Open binary input stream
+        path: Path the stream was opened from
+
+    Returns:
+        Iterator[bytes]: Lines without the trailing newline
+    """
+    if is_mappable(path, f):
+        return stack.enter_context(contextlib.closing(iter_mapped_lines(f)))
+    return iter_lines(stack.enter_context(ReadAhead(f)))
+
+
+# Transport parameters by S3 bucket (or "" for local paths), see
+# get_cached_transport_params()
+_transport_params_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def get_cached_transport_params(path: str) -> Dict[str, Any]:
+    """
+    Returns get_transport_params() for a path, memoized per S3 bucket.
+
+    Local inputs all share one entry and S3 outputs one per bucket, so the
+    configuration is only built once for each of them (S3 inputs are read
+    through S3RangeReader instead).
+
+    Args:
+        path: S3 URI or local path
+
+    Returns:
+        Dict[str, Any]: Copy of the transport parameters for smart_open
+    """
+    location = "/".join(path.split("/", 3)[:3]) if path.startswith("s3://") else ""
+    if location not in _transport_params_cache:
+        _transport_params_cache[location] = get_transport_params(path)
+    return dict(_transport_params_cache[location])
+
+
+def get_write_transport_params(path: str) -> Dict[str, Any]:
+    """
+    Returns smart_open transport parameters tuned for the output stream.
+
+    For S3 URIs, the multipart upload part size is raised to S3_MIN_PART_SIZE.
+
+    Args:
+        path: Output path (S3 URI or local file)
+
+    Returns:
+        Dict[str, Any]: Transport parameters for smart_open
+    """
+    transport_params = get_cached_transport_params(path)
+    if path.startswith("s3://"):
+        transport_params.setdefault("min_part_size", S3_MIN_PART_SIZE)
+    return transport_params
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    Read-only file object streaming an S3 object via parallel range requests.
+
+    The object is split into fixed-size byte ranges which are downloaded by a
+    thread pool. At most `2 * max_workers` ranges are in flight or buffered at any
+    time, and they are handed out strictly in order, so the reader behaves like a
+    regular sequential stream while keeping several connections busy.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        uri: str,
+        chunk_size: int = S3_RANGE_CHUNK_SIZE,
+        max_workers: int = S3_RANGE_WORKERS,
+    ) -> None:
+        """
+        Initialize the S3RangeReader.
+
+        Args:
+            s3_client: boto3 S3 client
+            uri: S3 URI of the object to read (s3://bucket/key)
+            chunk_size: Size of each range request in bytes
+            max_workers: Number of concurrent range requests
+        """
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket, _, self.key = uri[len("s3://") :].partition("/")
+        self.chunk_size = chunk_size
+        self.size = s3_client.head_object(Bucket=self.bucket, Key=self.key)[
+            "ContentLength"
+        ]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._offsets = iter(range(0, self.size, chunk_size))
+        self._pending: Deque[Future] = collections.deque()
+        self._buffer = memoryview(b"")
+        for _ in range(2 * max_workers):
+            self._schedule_next()
+
+    def _fetch(self, start: int) -> bytes:
+        end = min(start + self.chunk_size, self.size) - 1
+        response = self.s3_client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}"
+        )
+        return response["Body"].read()
+
+    def _schedule_next(self) -> None:
+        start = next(self._offsets, None)
+        if start is not None:
+            self._pending.append(self._executor.submit(self._fetch, start))
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._schedule_next()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._pending.clear()
+        super().close()
+
+
+class ReadAhead:
+    """
+    Iterator over the blocks of a binary stream, read by a background thread.
+
+    Up to `depth` reads of `chunk_size` bytes are queued on a single thread, so
+    they run in order while the caller processes earlier blocks. Network reads and
+    bz2 decompression release the GIL and thereby overlap with consolidation. Use
+    as a context manager: leaving it waits for the read in progress, so the stream
+    can be closed safely afterwards.
+    """
+
+    def __init__(
+        self,
+        f: IO[bytes],
+        chunk_size: int = READ_CHUNK_SIZE,
+        depth: int = READ_AHEAD_BLOCKS,
+    ) -> None:
+        """
+        Initialize the ReadAhead.
+
+        Args:
+            f: Binary input stream
+            chunk_size: Number of bytes to read at once
+            depth: Number of blocks to read ahead
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Deque[Future] = collections.deque()
+        for _ in range(depth):
+            self._pending.append(self._executor.submit(f.read, chunk_size))
+
+    def __iter__(self) -> Iterator[bytes]:
+        while self._pending:
+            block = self._pending.popleft().result()
+            if not block:
+                break
+            self._pending.append(self._executor.submit(self.f.read, self.chunk_size))
+            yield block
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+
+    def __enter__(self) -> "ReadAhead":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class WriteBehind:
+    """
+    Writes blocks to a binary stream from a background thread.
+
+    write() only queues the block, so S3 part uploads (or disk writes) overlap with
+    consolidation; it blocks once `depth` blocks are pending. Errors of the
+    background writes are raised by a later write() or by close(). Use as a
+    context manager around the output stream.
+    """
+
+    def __init__(self, f: IO[bytes], depth: int = WRITE_BEHIND_BLOCKS) -> None:
+        """
+        Initialize the WriteBehind.
+
+        Args:
+            f: Binary output stream
+            depth: Maximum number of blocks queued for writing
+        """
+        self.f = f
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Deque[Future] = collections.deque()
+
+    def write(self, block: Union[bytes, bytearray]) -> None:
+        """
+        Queue a block for writing. The block must not be modified afterwards.
+        """
+        if len(self._pending) >= self.depth:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(self.f.write, block))
+
+    def close(self) -> None:
+        """
+        Wait for all queued writes, raising the error of a failed one.
+        """
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._pending.clear()
+
+    def __enter__(self) -> "WriteBehind":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: stop without raising a second error
+            with contextlib.suppress(Exception):
+                self.close()
+
+
+def parse_arguments(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        args: Command-line arguments (uses sys.argv if None)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Consolidate canonical issues with langident/OCRQA enrichments."
+    )
+    parser.add_argument(
+        "--log-file", dest="log_file", help="Write log to FILE", metavar="FILE"
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--canonical-input",
+        dest="canonical_input",
+        help="Canonical issue input file (JSONL, required)",
+        required=True,
+    )
+    parser.add_argument(
+        "--enrichment-input",
+        dest="enrichment_input",
+        help="Langident/OCRQA enrichment input file (JSONL, required)",
+        required=True,
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        help="Consolidated canonical output file (JSONL, required)",
+        required=True,
+    )
+    parser.add_argument(
+        "--langident-run-id",
+        dest="langident_run_id",
+        help="Langident run ID for provenance tracking (required)",
+        required=True,
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help=(
+            "Validate consolidated canonical JSON against schema (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--enrichment-backend",
+        dest="enrichment_backend",
+        default="dict",
+        choices=ENRICHMENT_BACKENDS,
+        help=(
+            "How enrichments are looked up: 'dict' loads them into memory,"
+            " 'sorted-merge' streams them with a merge join (both inputs must be"
+            " sorted by ID) and 'sqlite' spills them to a temporary on-disk"
+            " database (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--enrichment-sorted",
+        dest="enrichment_backend",
+        action="store_const",
+        const="sorted-merge",
+        help="Shorthand for --enrichment-backend sorted-merge",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes consolidating issues in parallel"
+            " (default: %(default)s)"
+        ),
+    )
+    return parser.parse_args(args)
+
+
+class EnrichmentIndex:
+    """
+    Column-oriented store of the enrichment fields used for consolidation.
+
+    Only `lg`, `ocrqa` and `len` are kept, in parallel lists addressed through a
+    single content item ID → row mapping. This is far more compact than one
+    dictionary per content item when millions of enrichment records are loaded.
+    """
+
+    __slots__ = ("rows", "lg", "ocrqa", "char_len")
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, int] = {}
+        self.lg: List[Optional[str]] = []
+        self.ocrqa: List[Optional[float]] = []
+        self.char_len: List[Optional[int]] = []
+
+    def add(
+        self,
+        ci_id: str,
+        lg: Optional[str],
+        ocrqa: Optional[float],
+        char_len: Optional[int],
+    ) -> None:
+        """
+        Add the enrichment of a content item (replacing an earlier one).
+
+        Args:
+            ci_id: Content item ID
+            lg: Computed language
+            ocrqa: OCR quality score
+            char_len: Text length in characters
+        """
+        # Only a few dozen distinct language codes exist: share one string object
+        # per code instead of keeping a fresh copy for every record
+        if lg is not None:
+            lg = sys.intern(lg)
+        row = self.rows.get(ci_id)
+        if row is not None:
+            self.lg[row] = lg
+            self.ocrqa[row] = ocrqa
+            self.char_len[row] = char_len
+            return
+        self.rows[ci_id] = len(self.lg)
+        self.lg.append(lg)
+        self.ocrqa.append(ocrqa)
+        self.char_len.append(char_len)
+
+    def extend(
+        self,
+        records: Iterable[Tuple[str, Optional[str], Optional[float], Optional[int]]],
+    ) -> None:
+        """
+        Add enrichment records as yielded by iter_enrichment_records().
+        """
+        add = self.add
+        for record in records:
+            add(*record)
+
+    def compact(self) -> None:
+        """
+        Pack the numeric columns into typed arrays once loading is complete.
+
+        A column is only packed when every value round-trips exactly (all `ocrqa`
+        are floats, all `len` are 64-bit ints), so the output is unchanged;
+        otherwise it stays a list. Packed values need no object of their own and
+        carry no reference counts, which also keeps the pages holding them shared
+        with forked workers. No records may be added afterwards.
+        """
+        # The arrays are only indexed afterwards, like the lists they replace
+        if all(type(value) is float for value in self.ocrqa):
+            self.ocrqa = cast(
+                List[Optional[float]], array.array("d", cast(List[float], self.ocrqa))
+            )
+        if all(
+            type(value) is int and -(2**63) <= value < 2**63 for value in self.char_len
+        ):
+            self.char_len = cast(
+                List[Optional[int]], array.array("q", cast(List[int], self.char_len))
+            )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def for_issue(self, issue_id: str) -> "EnrichmentIndex":
+        """
+        Returns the enrichments to use for an issue: the whole index.
+        """
+        return self
+
+    def close(self) -> None:
+        """
+        Release the enrichments (nothing to do for an in-memory index).
+        """
+
+
+def iter_enrichment_records(
+    lines: Iterable[bytes],
+) -> Iterator[Tuple[str, Optional[str], Optional[float], Optional[int]]]:
+    """
+    Parse enrichment JSONL lines into the fields used for consolidation.
+
+    Args:
+        lines: Raw enrichment JSONL lines
+
+    Yields:
+        Tuple of content item ID, `lg`, `ocrqa` and `len`
+
+    Raises:
+        ConsolidationError: If a line is not valid JSON or has no `id`
+    """
+    loads = json_loads
+    decode = _enrichment_decoder.decode if _enrichment_decoder is not None else None
+    for line_num, line in enumerate(lines, 1):
+        if not line or line.isspace():
+            continue
+
+        try:
+            if decode is not None:
+                record = decode(line)
+                ci_id, lg, ocrqa, char_len = (
+                    record.id,
+                    record.lg,
+                    record.ocrqa,
+                    record.len,
+                )
+            else:
+                # One method lookup for the four fields
+                get = loads(line).get
+                ci_id, lg, ocrqa, char_len = (
+                    get("id"),
+                    get("lg"),
+                    get("ocrqa"),
+                    get("len"),
+                )
+        except _JSON_DECODE_ERRORS:
+            # E.g. NaN, which only the standard library accepts
+            get = json_loads_stdlib(line, f"enrichment line {line_num}").get
+            ci_id, lg, ocrqa, char_len = (
+                get("id"),
+                get("lg"),
+                get("ocrqa"),
+                get("len"),
+            )
+
+        if not ci_id:
+            raise ConsolidationError(f"Enrichment line {line_num} missing 'id' field")
+
+        yield ci_id, lg, ocrqa, char_len
+
+
+def get_issue_id(ci_id: str) -> str:
+    """
+    Returns the issue ID of a content item ID (e.g. WTCH-1828-01-06-a-i0001).
+    """
+    return ci_id.rpartition("-")[0]
+
+
+class SortedEnrichmentReader:
+    """
+    Merge join of a sorted enrichment stream with the canonical issues.
+
+    Both inputs must be sorted by ID. The enrichment records are grouped by issue
+    and only the group of the issue being consolidated is held in memory, so memory
+    use does not grow with the size of the enrichment file and no loading phase
+    precedes the first output. This trades the hash join of EnrichmentIndex, which
+    accepts inputs in any order, for a sort order requirement.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Tuple[str, Optional[str], Optional[float], Optional[int]]],
+    ) -> None:
+        """
+        Initialize the SortedEnrichmentReader.
+
+        Args:
+            records: Enrichment records as yielded by iter_enrichment_records()
+        """
+        self._groups = itertools.groupby(records, key=lambda r: get_issue_id(r[0]))
+        self._group: Optional[Tuple[str, Iterator[Any]]] = next(self._groups, None)
+        self._last_group_id = ""
+        self._last_issue_id = ""
+
+    def _next_group(self) -> None:
+        self._last_group_id = self._group[0] if self._group else ""
+        self._group = next(self._groups, None)
+        if self._group is not None and self._group[0] <= self._last_group_id:
+            raise ConsolidationError(
+                f"Enrichment input is not sorted by ID: issue {self._group[0]}"
+                f" follows {self._last_group_id}"
+            )
+
+    def for_issue(self, issue_id: str) -> EnrichmentIndex:
+        """
+        Advance the enrichment stream to an issue and return its enrichments.
+
+        Args:
+            issue_id: ID of the next canonical issue
+
+        Returns:
+            EnrichmentIndex holding the enrichments of the issue (possibly empty)
+
+        Raises:
+            ConsolidationError: If the canonical or enrichment input is not sorted
+        """
+        if issue_id < self._last_issue_id:
+            raise ConsolidationError(
+                f"Canonical input is not sorted by ID: issue {issue_id}"
+                f" follows {self._last_issue_id}"
+            )
+        self._last_issue_id = issue_id
+
+        # Skip enrichments of issues that are absent from the canonical input
+        while self._group is not None and self._group[0] < issue_id:
+            log.debug("Skipping enrichments of unknown issue %s", self._group[0])
+            self._next_group()
+
+        enrichments = EnrichmentIndex()
+        if self._group is not None and self._group[0] == issue_id:
+            enrichments.extend(self._group[1])
+            self._next_group()
+        return enrichments
+
+    def close(self) -> None:
+        """
+        Release the enrichments (the stream is closed by its owner).
+        """
+
+
+class SqliteEnrichmentStore:
+    """
+    Enrichments spilled to a temporary sqlite database keyed by content item ID.
+
+    Memory use does not grow with the size of the enrichment file and, unlike
+    SortedEnrichmentReader, the inputs may come in any order. The enrichments of an
+    issue are fetched with a single range query on the content item ID prefix. The
+    database file is removed by close().
+    """
+
+    def __init__(self) -> None:
+        fd, self.path = tempfile.mkstemp(prefix="enrichments-", suffix=".sqlite3")
+        os.close(fd)
+        self._count = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes open their own connection to the database
+        return {"path": self.path, "_count": self._count, "_connection": None}
+
+    def extend(
+        self,
+        records: Iterable[Tuple[str, Optional[str], Optional[float], Optional[int]]],
+    ) -> None:
+        """
+        Insert enrichment records as yielded by iter_enrichment_records().
+
+        A later record of the same content item replaces an earlier one.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            # The database is rebuilt on every run: durability is not needed
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS enrichments"
+                " (ci_id TEXT PRIMARY KEY, lg TEXT, ocrqa, len) WITHOUT ROWID"
+            )
+            with connection:
+                for batch in iter_batches(records, SQLITE_INSERT_BATCH_SIZE):
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO enrichments VALUES (?, ?, ?, ?)",
+                        batch,
+                    )
+            (self._count,) = connection.execute(
+                "SELECT COUNT(*) FROM enrichments"
+            ).fetchone()
+        finally:
+            connection.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def for_issue(self, issue_id: str) -> EnrichmentIndex:
+        """
+        Fetch the enrichments of an issue from the database.
+
+        Args:
+            issue_id: ID of the canonical issue
+
+        Returns:
+            EnrichmentIndex holding the enrichments of the issue (possibly empty)
+        """
+        if self._connection is None:
+            # as_uri() percent-encodes characters such as ?, # or % in the path
+            uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro"
+            self._connection = sqlite3.connect(uri, uri=True)
+        enrichments = EnrichmentIndex()
+        # Content item IDs are the issue ID followed by "-" and a suffix, so they
+        # sort between issue_id + "-" and issue_id + "." ("-" precedes ".")
+        enrichments.extend(
+            self._connection.execute(
+                "SELECT ci_id, lg, ocrqa, len FROM enrichments"
+                " WHERE ci_id > ? AND ci_id < ?",
+                (issue_id + "-", issue_id + "."),
+            )
+        )
+        return enrichments
+
+    def close(self) -> None:
+        """
+        Close the database connection and remove the database file.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+def consolidate_content_item(
+    ci_metadata: Dict[str, Any],
+    enrichments: EnrichmentIndex,
+    langident_run_id: str,
+    row: Any = _MISSING,
+) -> Dict[str, Any]:
+    """
+    Consolidate a single content item with its enrichment data.
+
+    Args:
+        ci_metadata: Content item metadata dictionary
+        enrichments: Index of all enrichment data
+        langident_run_id: Run ID for langident provenance
+        row: Row of the content item in `enrichments` (None if absent), when the
+            caller has already looked it up
+
+    Returns:
+        Updated metadata with consolidated fields (if enrichment available)
+
+    Note:
+        Content items without enrichment data are returned unchanged.
+        This includes images and items with text too short for analysis.
+    """
+    _consolidate_content_item(ci_metadata, enrichments, langident_run_id, row)
+    return ci_metadata
+
+
+def _consolidate_content_item(
+    ci_metadata: Dict[str, Any],
+    enrichments: EnrichmentIndex,
+    langident_run_id: str,
+    row: Any = _MISSING,
+    debug: Optional[bool] = None,
+) -> bool:
+    """
+    Implementation of consolidate_content_item() for the per-item loop.
+
+    `debug` tells whether debug logging is enabled; the loop checks it once per
+    issue instead of once per content item.
+
+    Returns:
+        bool: Whether consolidated fields were added (False if skipped)
+    """
+    ci_id = ci_metadata.get("id")
+
+    if not ci_id:
+        raise ConsolidationError("Content item missing 'id' field")
+
+    # Checked once per call unless passed in, so that debug messages cost nothing
+    # in production runs
+    if debug is None:
+        debug = log.isEnabledFor(logging.DEBUG)
+
+    # Clean up None/empty values for optional string fields that should only be present when meaningful
+    for field in OPTIONAL_CI_FIELDS:
+        value = ci_metadata.get(field, _MISSING)
+        if value is not _MISSING:
+            # Remove if None or empty string
+            if value is None or (isinstance(value, str) and value.strip() == ""):
+                if debug:
+                    log.debug(
+                        "Removing field '%s' with None/empty value from content"
+                        " item %s",
+                        field,
+                        ci_id,
+                    )
+                del ci_metadata[field]
+
+    # Always rename lg → lg_original if it exists (for all content items)
+    lg_original = ci_metadata.pop("lg", _MISSING)
+    if lg_original is not _MISSING:
+        ci_metadata["lg_original"] = lg_original
+        if debug:
+            log.debug("Renamed lg → lg_original for %s", ci_id)
+    else:
+        # Handle legacy 'l' field
+        lg_original = ci_metadata.pop("l", _MISSING)
+        if lg_original is not _MISSING:
+            ci_metadata["lg_original"] = lg_original
+            if debug:
+                log.debug("Renamed l → lg_original for %s", ci_id)
+
+    # Skip consolidation for image content items (they don't have lg/ocrqa)
+    ci_type = ci_metadata.get("tp")
+    if ci_type == "image":
+        if debug:
+            log.debug("Skipping consolidation for image content item: %s", ci_id)
+        return False
+
+    # Check if enrichment exists - if not, warn and skip (don't fail)
+    if row is _MISSING:
+        row = enrichments.rows.get(ci_id)
+    if row is None:
+        log.warning(
+            "Missing enrichment data for content item: %s (type: %s). "
+            "Skipping consolidation for this item.",
+            ci_id,
+            ci_type,
+        )
+        return False
+
+    # Add consolidated fields
+    ci_metadata["consolidated_lg"] = enrichments.lg[row]
+    ci_metadata["consolidated_ocrqa"] = enrichments.ocrqa[row]
+    ci_metadata["consolidated_char_len"] = enrichments.char_len[row]
+    ci_metadata["consolidated_langident_run_id"] = langident_run_id
+
+    # Note: consolidated_reocr_applied and consolidated_reocr_run_id
+    # should be added here if re-OCR information is available
+
+    return True
+
+
+def consolidate_content_items(
+    content_items: List[Dict[str, Any]],
+    enrichments: EnrichmentIndex,
+    langident_run_id: str,
+) -> Tuple[int, int, Optional[str]]:
+    """
+    Consolidate the content items of an issue in place.
+
+    This is the pure Python implementation of the compiled kernel in
+    _consolidatedcanonical.pyx, which process_issue() uses instead when built.
+
+    Args:
+        content_items: Content items of the issue (`i` field)
+        enrichments: Index of all enrichment data
+        langident_run_id: Run ID for langident provenance
+
+    Returns:
+        Tuple[int, int, Optional[str]]: Number of consolidated and of skipped
+        content items, and the type (`tp`) of the first content item that is an
+        article or a page (None if there is none), from which olr is inferred
+    """
+    processed_count = 0
+    skipped_count = 0
+    first_type = None
+    # Look up the enrichment rows of all content items in one pass, then apply
+    # them in a second one
+    metadata_list = [
+        ci_metadata for ci in content_items if (ci_metadata := ci.get("m"))
+    ]
+    rows = list(map(enrichments.rows.get, [m.get("id") for m in metadata_list]))
+
+    # Local bindings avoid a global lookup and a logging level check per
+    # content item
+    consolidate = _consolidate_content_item
+    debug = log.isEnabledFor(logging.DEBUG)
+    for ci_metadata, row in zip(metadata_list, rows):
+        # Track if we skipped consolidation
+        if consolidate(ci_metadata, enrichments, langident_run_id, row, debug):
+            processed_count += 1
+        else:
+            skipped_count += 1
+        if first_type is None:
+            ci_type = ci_metadata.get("tp")
+            if ci_type == "article" or ci_type == "page":
+                first_type = ci_type
+
+    return processed_count, skipped_count, first_type
+
+
+def process_issue(
+    issue_data: Dict[str, Any],
+    enrichments: EnrichmentIndex,
+    langident_run_id: str,
+    timestamp: str,
+) -> Dict[str, Any]:
+    """
+    Process a single issue, consolidating all its content items.
+
+    Args:
+        issue_data: Issue data dictionary
+        enrichments: Index of all enrichment data
+        langident_run_id: Run ID for langident provenance
+        timestamp: Processing timestamp to set as the issue's `ts`
+
+    Returns:
+        Consolidated issue data
+    """
+    issue_id = issue_data.get("id", "UNKNOWN")
+    debug = log.isEnabledFor(logging.DEBUG)
+    if debug:
+        log.debug("Processing issue: %s", issue_id)
 
-log = logging.getLogger(__name__)
+    # Clean up None/empty values for optional fields at issue level
+    for field in OPTIONAL_ISSUE_FIELDS:
+        value = issue_data.get(field, _MISSING)
+        if value is not _MISSING:
+            # Remove if None or (for strings) empty
+            should_remove = False
+            if value is None:
+                should_remove = True
+            elif isinstance(value, str) and value.strip() == "":
+                should_remove = True
+
+            if should_remove:
+                if debug:
+                    log.debug(
+                        "Removing field '%s' with None/empty value from issue %s",
+                        field,
+                        issue_id,
+                    )
+                del issue_data[field]
+
+    # Store original timestamp before updating; cdt is removed in the same probe
+    # that reads it as the fallback for a missing ts
+    cdt = issue_data.pop("cdt", None)
+    original_ts = issue_data.get("ts") or cdt
+    if not original_ts:
+        raise ConsolidationError(f"Issue {issue_id} missing both 'ts' and 'cdt' fields")
+
+    # Convert to ISO8601 if needed
+    original_ts_iso = ensure_iso8601_z(original_ts)
+
+    # Set consolidated flag and timestamps
+    issue_data["consolidated"] = True
+    issue_data["consolidated_ts_original"] = original_ts_iso
+    issue_data["ts"] = timestamp
+
+    # Process all content items; the same pass finds the type of the first
+    # article or page for the olr inference below
+    content_items = issue_data.get("i", _EMPTY)
+    if not content_items:
+        log.warning("Issue %s has no content items", issue_id)
+        processed_count, skipped_count, first_type = 0, 0, None
+    elif _consolidatedcanonical is not None:
+        processed_count, skipped_count, first_type = (
+            _consolidatedcanonical.consolidate_content_items(
+                content_items, enrichments, langident_run_id, log, ConsolidationError
+            )
+        )
+    else:
+        processed_count, skipped_count, first_type = consolidate_content_items(
+            content_items, enrichments, langident_run_id
+        )
 
-SCHEMA_BASE_URI = "https://impresso.github.io/impresso-schemas/json/canonical/"
-IMPRESSO_SCHEMA = "issue.schema.json"
+    # Determine olr property if not present
+    if "olr" not in issue_data:
+        if debug:
+            log.debug(
+                "Inferring olr for issue %s (num content items=%d)",
+                issue_id,
+                len(content_items),
+            )
+
+        # Set olr based on content item types
+        if first_type == "article":
+            issue_data["olr"] = True
+            log.info(
+                "Inferred olr=true for issue %s (contains article content items)",
+                issue_id,
+            )
+        elif first_type == "page":
+            issue_data["olr"] = False
+            log.info(
+                "Inferred olr=false for issue %s (contains only page content items)",
+                issue_id,
+            )
+        else:
+            # Default to true if there are other content types (ads, images, etc.)
+            # or if we couldn't determine from content items
+            issue_data["olr"] = True
+            log.info(
+                "Inferred olr=true for issue %s (default: no page or article types"
+                " found)",
+                issue_id,
+            )
+    elif debug:
+        log.debug(
+            "Issue %s already has olr=%s, not inferring",
+            issue_id,
+            issue_data["olr"],
+        )
 
+    log.info(
+        "Consolidated %d content items in issue %s (skipped %d items without"
+        " enrichment data)",
+        processed_count,
+        issue_id,
+        skipped_count,
+    )
 
-def initialize_validator(
-    schema_base_uri: str = SCHEMA_BASE_URI, schema: str = IMPRESSO_SCHEMA
-) -> jsonschema.Draft7Validator:
+    return issue_data
+
+
+def validate_issue(
+    schema_validator: SchemaValidator,
+    issue_data: Dict[str, Any],
+    source_file: str = "",
+) -> bool:
     """
-    Initializes the schema validator.
+    Validates an issue against the schema with detailed diagnostics.
 
     Args:
-        schema_base_uri: Base URI for the schema
-        schema: Schema filename
+        schema_validator: Validator returned by initialize_validator()
+        issue_data: The issue data to validate
+        source_file: Source filename for error reporting
 
     Returns:
-        Draft7Validator: Configured validator instance
+        bool: True if the issue is valid, False otherwise
     """
-    with smart_open(
-        schema_base_uri + schema,
-        "r",
-    ) as f:
-        schema_dict = json.load(f)
+    try:
+        schema_validator.validate(issue_data)
+        log.debug("Issue %s is valid", issue_data.get("id", "UNKNOWN"))
+        return True
+    except jsonschema.ValidationError as e:
+        issue_id = issue_data.get("id", "UNKNOWN")
 
-    # Directly create the validator without a registry or a resolver
-    validator = Draft7Validator(schema_dict)
-    return validator
+        # Extract content item information if error is in a content item
+        ci_id = "N/A"
+        ci_index = None
+        error_path = list(e.absolute_path)
 
+        # Hotfix: If validation fails once, attempt global coordinate correction
+        # Convert every "c" list in every content item from string to int where possible
+        try:
+            content_items = issue_data.get("i", [])
+            any_converted = False
+            for ci in content_items:
+                if "c" in ci and isinstance(ci["c"], list):
+                    for idx, coord in enumerate(ci["c"]):
+                        if isinstance(coord, str):
+                            try:
+                                ci["c"][idx] = int(coord)
+                                any_converted = True
+                            except (ValueError, TypeError):
+                                pass
+
+            if any_converted:
+                log.warning(
+                    "Applied global coordinate conversion hotfix for issue %s",
+                    issue_id,
+                )
+                schema_validator.validate(issue_data)
+                log.info(
+                    "Issue %s is now valid after global coordinate conversion",
+                    issue_id,
+                )
+                return True
+
+        except jsonschema.ValidationError:
+            # If still invalid, continue to standard error reporting below
+            pass
+        except Exception:
+            pass
+
+        # Check if error path contains content item reference for detailed reporting
+        # Path format: ['i', index, 'm', 'consolidated_ocrqa']
+        if len(error_path) >= 2 and error_path[0] == "i":
+            ci_index = error_path[1]
+            try:
+                content_items = issue_data.get("i", [])
+                if isinstance(ci_index, int) and ci_index < len(content_items):
+                    ci_metadata = content_items[ci_index].get("m", {})
+                    ci_id = ci_metadata.get("id", "UNKNOWN")
+            except (IndexError, TypeError, KeyError):
+                pass
 
-def parse_arguments(args: Optional[List[str]] = None) -> argparse.Namespace:
+        # Build detailed error message
+        error_location = f"File: {source_file}" if source_file else "File: N/A"
+        error_details = [
+            "=" * 80,
+            "VALIDATION ERROR",
+            error_location,
+            f"Issue ID: {issue_id}",
+            f"Content Item ID: {ci_id}",
+            f"Content Item Index: {ci_index if ci_index is not None else 'N/A'}",
+            f"Error Path: {'.'.join(str(p) for p in error_path)}",
+            f"Error Message: {e.message}",
+            f"Failed Value: {e.instance}",
+            f"Schema Path: {'.'.join(str(p) for p in e.absolute_schema_path)}",
+            "=" * 80,
+        ]
+
+        log.error("\n".join(error_details))
+
+        # Also log the full validation error for debugging
+        log.debug("Full validation error details: %s", e)
+
+        return False
+    except jsonschema.SchemaError as e:
+        log.error("Schema error: %s", e)
+        return False
+
+
+def consolidate_line(
+    line: bytes,
+    line_num: int,
+    enrichments: Union[EnrichmentIndex, SortedEnrichmentReader, SqliteEnrichmentStore],
+    langident_run_id: str,
+    timestamp: str,
+    schema_validator: Optional[SchemaValidator] = None,
+    source_file: str = "",
+) -> bytes:
     """
-    Parse command-line arguments.
+    Consolidate one canonical JSONL line and return the serialized output line.
 
     Args:
-        args: Command-line arguments (uses sys.argv if None)
+        line: Raw canonical issue JSON
+        line_num: Line number in the canonical input (for error reporting)
+        enrichments: Enrichment lookup (see --enrichment-backend)
+        langident_run_id: Run ID for langident provenance
+        timestamp: Processing timestamp to set as the issue's `ts`
+        schema_validator: Validator to check the output with (None to skip)
+        source_file: Source filename for error reporting
 
     Returns:
-        argparse.Namespace: Parsed arguments
+        bytes: Consolidated issue as UTF-8 JSON terminated by a newline
     """
-    parser = argparse.ArgumentParser(
-        description="Consolidate canonical issues with langident/OCRQA enrichments."
-    )
-    parser.add_argument(
-        "--log-file", dest="log_file", help="Write log to FILE", metavar="FILE"
-    )
-    parser.add_argument(
-        "--log-level",
-        default="INFO",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
-        help="Logging level (default: %(default)s)",
-    )
-    parser.add_argument(
-        "--canonical-input",
-        dest="canonical_input",
-        help="Canonical issue input file (JSONL, required)",
-        required=True,
-    )
-    parser.add_argument(
-        "--enrichment-input",
-        dest="enrichment_input",
-        help="Langident/OCRQA enrichment input file (JSONL, required)",
-        required=True,
-    )
-    parser.add_argument(
-        "-o",
-        "--output",
-        dest="output",
-        help="Consolidated canonical output file (JSONL, required)",
-        required=True,
-    )
-    parser.add_argument(
-        "--langident-run-id",
-        dest="langident_run_id",
-        help="Langident run ID for provenance tracking (required)",
-        required=True,
-    )
-    parser.add_argument(
-        "--validate",
-        action="store_true",
-        help=(
-            "Validate consolidated canonical JSON against schema (default: %(default)s)"
-        ),
+    issue_data, stdlib = parse_json_line(line, f"canonical line {line_num}")
+
+    issue_enrichments = enrichments.for_issue(issue_data.get("id", ""))
+    consolidated_issue = process_issue(
+        issue_data, issue_enrichments, langident_run_id, timestamp
     )
-    return parser.parse_args(args)
+
+    # Validate if validation is enabled
+    if schema_validator is not None:
+        if not validate_issue(schema_validator, consolidated_issue, source_file):
+            raise ConsolidationError(f"Validation failed for issue on line {line_num}")
+
+    return json_dumps_line(consolidated_issue, stdlib)
+
+
+# Arguments of consolidate_line() after the line itself, set once per worker
+# process by _init_worker() so the enrichments are not sent with every task
+_worker_args: tuple = ()
+
+
+def _init_worker(
+    logging_options: Optional[Tuple[str, Optional[str]]], *args: Any
+) -> None:
+    global _worker_args
+    # Forked workers inherit the logging configuration, spawned ones start without
+    if logging_options is not None:
+        setup_logging(*logging_options, logger=log)
+    _worker_args = args
+
+
+def _consolidate_line_worker(item: Tuple[int, bytes]) -> bytes:
+    line_num, line = item
+    return consolidate_line(line, line_num, *_worker_args)
+
+
+def get_worker_context() -> Any:
+    """
+    Returns the multiprocessing context for the worker pool.
+
+    On Linux, forked workers inherit the loaded enrichments copy-on-write instead
+    of receiving a pickled copy each, as they would with the "spawn" and
+    "forkserver" start methods. Objects surviving until the fork are moved out of
+    the garbage collector's reach, so that collections in the workers do not
+    write to, and thereby copy, the pages holding the enrichments. Elsewhere (e.g.
+    macOS, where system libraries start threads that make forking unsafe) the
+    platform's default start method is used.
+    """
+    if not sys.platform.startswith("linux"):
+        return multiprocessing.get_context()
+    gc.freeze()
+    return multiprocessing.get_context("fork")
+
+
+def iter_batches(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Yield successive lists of at most `size` items from an iterable.
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
 
 
 class ConsolidatedCanonicalProcessor:
@@ -176,6 +1661,8 @@ class ConsolidatedCanonicalProcessor:
         log_level: str = "INFO",
         log_file: Optional[str] = None,
         validate: bool = False,
+        workers: int = 1,
+        enrichment_backend: str = "dict",
     ) -> None:
         """
         Initialize the ConsolidatedCanonicalProcessor.
@@ -188,14 +1675,20 @@ class ConsolidatedCanonicalProcessor:
             log_level: Logging level (default: "INFO")
             log_file: Path to log file (default: None)
             validate: Whether to validate output against schema (default: False)
+            workers: Number of worker processes for consolidation (default: 1)
+            enrichment_backend: How enrichments are looked up, one of
+                ENRICHMENT_BACKENDS (default: "dict")
         """
         self.canonical_input = canonical_input
         self.enrichment_input = enrichment_input
         self.output_file = output_file
-        self.langident_run_id = langident_run_id
+        # Interned: the same string object is shared by every consolidated item
+        self.langident_run_id = sys.intern(langident_run_id)
         self.log_level = log_level
         self.log_file = log_file
         self.validate = validate
+        self.workers = max(1, workers)
+        self.enrichment_backend = enrichment_backend
 
         # Configure the module-specific logger
         setup_logging(self.log_level, self.log_file, logger=log)
@@ -209,374 +1702,138 @@ class ConsolidatedCanonicalProcessor:
             self.schema_validator = initialize_validator()
             log.info("Schema validation enabled")
 
-        log.info(f"Initialized processor with timestamp: {self.timestamp}")
-        log.info(f"Langident run ID: {self.langident_run_id}")
+        log.info("Initialized processor with timestamp: %s", self.timestamp)
+        log.info("Langident run ID: %s", self.langident_run_id)
+
+        if self.enrichment_backend == "sorted-merge" and self.workers > 1:
+            log.warning(
+                "Sorted enrichment streaming runs in a single process, ignoring"
+                " --workers %d",
+                self.workers,
+            )
+            self.workers = 1
+
+    def open_input(self, path: str) -> IO[bytes]:
+        """
+        Open an input file for binary reading.
+
+        S3 objects are downloaded with parallel range requests; compression is
+        inferred from the file extension as smart_open would do. Local files are
+        opened with smart_open directly.
 
-    def load_enrichments(self) -> Dict[str, Dict[str, Any]]:
+        Args:
+            path: Local path or S3 URI of the input
+
+        Returns:
+            IO[bytes]: Decompressed binary stream of the input JSONL
+        """
+        if not path.startswith("s3://"):
+            return smart_open(
+                path, "rb", transport_params=get_cached_transport_params(path)
+            )
+
+        raw = S3RangeReader(self.s3_client, path)
+        log.info(
+            "Streaming %s (%d bytes) with %d parallel range requests",
+            path,
+            raw.size,
+            S3_RANGE_WORKERS,
+        )
+        return compression_wrapper(
+            io.BufferedReader(raw, buffer_size=S3_READ_BUFFER_SIZE),
+            "rb",
+            filename=path,
+        )
+
+    def open_enrichment_input(self) -> IO[bytes]:
+        """
+        Open the enrichment input for binary reading.
+
+        Returns:
+            IO[bytes]: Decompressed binary stream of the enrichment JSONL
+        """
+        return self.open_input(self.enrichment_input)
+
+    def load_enrichments(self) -> Union[EnrichmentIndex, SqliteEnrichmentStore]:
         """
         Load enrichment data from langident/OCRQA file.
 
         Returns:
-            Dictionary mapping content item IDs to enrichment data
+            EnrichmentIndex of the enrichment data by content item ID, or a
+            SqliteEnrichmentStore with the sqlite backend
 
         Raises:
+            ConsolidationError: If an enrichment line is invalid
             SystemExit: If enrichment file cannot be read
         """
-        enrichments = {}
+        enrichments: Union[EnrichmentIndex, SqliteEnrichmentStore]
+        if self.enrichment_backend == "sqlite":
+            enrichments = SqliteEnrichmentStore()
+            log.info("Spilling enrichments to: %s", enrichments.path)
+        else:
+            enrichments = EnrichmentIndex()
 
-        log.info(f"Loading enrichments from: {self.enrichment_input}")
+        log.info("Loading enrichments from: %s", self.enrichment_input)
 
         try:
-            with smart_open(
-                self.enrichment_input,
-                "rt",
-                encoding="utf-8",
-                transport_params=get_transport_params(self.enrichment_input),
-            ) as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        data = json.loads(line)
-                        ci_id = data.get("id")
-
-                        if not ci_id:
-                            log.error(f"Enrichment line {line_num} missing 'id' field")
-                            sys.exit(1)
-
-                        enrichments[ci_id] = {
-                            "lg": data.get("lg"),
-                            "ocrqa": data.get("ocrqa"),
-                            "len": data.get("len"),
-                            "lg_decision": data.get("lg_decision"),
-                            "systems": data.get("systems", {}),
-                            "alphabetical_ratio": data.get("alphabetical_ratio"),
-                        }
-
-                    except json.JSONDecodeError as e:
-                        log.error(f"Invalid JSON in enrichment line {line_num}: {e}")
-                        sys.exit(1)
-
+            with contextlib.ExitStack() as stack:
+                f = stack.enter_context(self.open_enrichment_input())
+                lines = enter_input_lines(stack, f, self.enrichment_input)
+                enrichments.extend(iter_enrichment_records(lines))
+
+        except ConsolidationError:
+            enrichments.close()
+            raise
         except Exception as e:
-            log.error(f"Error reading enrichment file: {e}", exc_info=True)
+            enrichments.close()
+            log.error("Error reading enrichment file: %s", e, exc_info=True)
             sys.exit(1)
 
-        log.info(f"Loaded {len(enrichments)} enrichment records")
+        if isinstance(enrichments, EnrichmentIndex):
+            enrichments.compact()
+        log.info("Loaded %d enrichment records", len(enrichments))
         return enrichments
 
     def consolidate_content_item(
-        self, ci_metadata: Dict[str, Any], enrichments: Dict[str, Dict[str, Any]]
+        self, ci_metadata: Dict[str, Any], enrichments: EnrichmentIndex
     ) -> Dict[str, Any]:
         """
-        Consolidate a single content item with its enrichment data.
-
-        Args:
-            ci_metadata: Content item metadata dictionary
-            enrichments: Dictionary of all enrichment data
-
-        Returns:
-            Updated metadata with consolidated fields (if enrichment available)
+        Consolidate a single content item with this processor's run ID.
 
-        Note:
-            Content items without enrichment data are returned unchanged.
-            This includes images and items with text too short for analysis.
+        See the module-level consolidate_content_item() for details.
         """
-        ci_id = ci_metadata.get("id")
-
-        if not ci_id:
-            log.error("Content item missing 'id' field")
-            sys.exit(1)
-
-        # Clean up None/empty values for optional string fields that should only be present when meaningful
-        optional_string_fields = ["t", "iiif_link", "var_t", "archival_note"]
-        for field in optional_string_fields:
-            if field in ci_metadata:
-                value = ci_metadata[field]
-                # Remove if None or empty string
-                if value is None or (isinstance(value, str) and value.strip() == ""):
-                    log.debug(
-                        "Removing field '%s' with None/empty value from content"
-                        " item %s",
-                        field,
-                        ci_id,
-                    )
-                    del ci_metadata[field]
-
-        # Always rename lg → lg_original if it exists (for all content items)
-        if "lg" in ci_metadata:
-            ci_metadata["lg_original"] = ci_metadata.pop("lg")
-            log.debug(f"Renamed lg → lg_original for {ci_id}")
-        elif "l" in ci_metadata:
-            # Handle legacy 'l' field
-            ci_metadata["lg_original"] = ci_metadata.pop("l")
-            log.debug(f"Renamed l → lg_original for {ci_id}")
-
-        # Skip consolidation for image content items (they don't have lg/ocrqa)
-        ci_type = ci_metadata.get("tp")
-        if ci_type == "image":
-            log.debug(f"Skipping consolidation for image content item: {ci_id}")
-            return ci_metadata
-
-        # Check if enrichment exists - if not, warn and skip (don't fail)
-        if ci_id not in enrichments:
-            log.warning(
-                f"Missing enrichment data for content item: {ci_id} (type: {ci_type}). "
-                "Skipping consolidation for this item."
-            )
-            return ci_metadata
-
-        enrichment = enrichments[ci_id]
-
-        # Add consolidated fields
-        ci_metadata["consolidated_lg"] = enrichment["lg"]
-        ci_metadata["consolidated_ocrqa"] = enrichment["ocrqa"]
-        ci_metadata["consolidated_char_len"] = enrichment["len"]
-        ci_metadata["consolidated_langident_run_id"] = self.langident_run_id
-
-        # Note: consolidated_reocr_applied and consolidated_reocr_run_id
-        # should be added here if re-OCR information is available
-
-        return ci_metadata
+        return consolidate_content_item(ci_metadata, enrichments, self.langident_run_id)
 
     def process_issue(
         self,
         issue_data: Dict[str, Any],
-        enrichments: Dict[str, Dict[str, Any]],
+        enrichments: EnrichmentIndex,
     ) -> Dict[str, Any]:
         """
-        Process a single issue, consolidating all its content items.
-
-        Args:
-            issue_data: Issue data dictionary
-            enrichments: Dictionary of all enrichment data
+        Process a single issue with this processor's run ID and timestamp.
 
-        Returns:
-            Consolidated issue data
+        See the module-level process_issue() for details.
         """
-        issue_id = issue_data.get("id", "UNKNOWN")
-        log.debug("Processing issue: %s", issue_id)
-
-        # Clean up None/empty values for optional fields at issue level
-        optional_issue_fields = {
-            "s": "array",  # text styles
-            "n": "string or array",  # notes
-            "media_title_variant": "string",
-            "iiif_manifest_uri": "string",
-            "rc": "string",  # radio channel
-            "rp": "string",  # radio program
-        }
-        for field, field_type in optional_issue_fields.items():
-            if field in issue_data:
-                value = issue_data[field]
-                # Remove if None or (for strings) empty
-                should_remove = False
-                if value is None:
-                    should_remove = True
-                elif isinstance(value, str) and value.strip() == "":
-                    should_remove = True
-
-                if should_remove:
-                    log.debug(
-                        "Removing field '%s' with None/empty value from issue %s",
-                        field,
-                        issue_id,
-                    )
-                    del issue_data[field]
-
-        # Store original timestamp before updating
-        original_ts = issue_data.get("ts") or issue_data.get("cdt")
-        if not original_ts:
-            log.error("Issue %s missing both 'ts' and 'cdt' fields", issue_id)
-            sys.exit(1)
-
-        # Convert to ISO8601 if needed
-        original_ts_iso = ensure_iso8601_z(original_ts)
-
-        # Set consolidated flag and timestamps
-        issue_data["consolidated"] = True
-        issue_data["consolidated_ts_original"] = original_ts_iso
-        issue_data["ts"] = self.timestamp
-        if "cdt" in issue_data:
-            del issue_data["cdt"]  # Remove cdt if present
-
-        # Determine olr property if not present
-        if "olr" not in issue_data:
-            # Check content item types
-            content_items = issue_data.get("i", [])
-            has_non_page_article = False
-            has_page = False
-
-            log.debug(
-                "Inferring olr for issue %s (num content items=%d)",
-                issue_id,
-                len(content_items),
-            )
-
-            for ci in content_items:
-                ci_metadata = ci.get("m", {})
-                ci_type = ci_metadata.get("tp")
-
-                if ci_type == "article":
-                    has_non_page_article = True
-                    break  # Found article, no need to check further
-                elif ci_type == "page":
-                    has_page = True
-                    break  # Found page, can determine outcome
-
-            # Set olr based on content item types
-            if has_non_page_article:
-                issue_data["olr"] = True
-                log.info(
-                    "Inferred olr=true for issue %s (contains article content items)",
-                    issue_id,
-                )
-            elif has_page:
-                issue_data["olr"] = False
-                log.info(
-                    "Inferred olr=false for issue %s (contains only page content"
-                    " items)",
-                    issue_id,
-                )
-            else:
-                # Default to true if there are other content types (ads, images, etc.)
-                # or if we couldn't determine from content items
-                issue_data["olr"] = True
-                log.info(
-                    "Inferred olr=true for issue %s (default: no page or article types"
-                    " found)",
-                    issue_id,
-                )
-        else:
-            log.debug(
-                "Issue %s already has olr=%s, not inferring",
-                issue_id,
-                issue_data["olr"],
-            )
-
-        # Process all content items
-        content_items = issue_data.get("i", [])
-        if not content_items:
-            log.warning("Issue %s has no content items", issue_id)
-
-        processed_count = 0
-        skipped_count = 0
-        for ci in content_items:
-            ci_metadata = ci.get("m", {})
-            if ci_metadata:
-                updated_metadata = self.consolidate_content_item(
-                    ci_metadata, enrichments
-                )
-                # Track if we skipped consolidation
-                if "consolidated_lg" not in updated_metadata:
-                    skipped_count += 1
-                else:
-                    processed_count += 1
-
-        log.info(
-            "Consolidated %d content items in issue %s (skipped %d items without"
-            " enrichment data)",
-            processed_count,
-            issue_id,
-            skipped_count,
+        return process_issue(
+            issue_data, enrichments, self.langident_run_id, self.timestamp
         )
 
-        return issue_data
-
     def validate_issue(self, issue_data: Dict[str, Any], source_file: str = "") -> bool:
         """
         Validates an issue against the schema with detailed diagnostics.
 
-        Args:
-            issue_data: The issue data to validate
-            source_file: Source filename for error reporting
-
-        Returns:
-            bool: True if the issue is valid, False otherwise
+        See the module-level validate_issue() for details.
         """
-        try:
-            self.schema_validator.validate(issue_data)
-            log.debug("Issue %s is valid", issue_data.get("id", "UNKNOWN"))
-            return True
-        except jsonschema.ValidationError as e:
-            issue_id = issue_data.get("id", "UNKNOWN")
-
-            # Extract content item information if error is in a content item
-            ci_id = "N/A"
-            ci_index = None
-            error_path = list(e.absolute_path)
-
-            # Hotfix: If validation fails once, attempt global coordinate correction
-            # Convert every "c" list in every content item from string to int where possible
-            try:
-                content_items = issue_data.get("i", [])
-                any_converted = False
-                for ci in content_items:
-                    if "c" in ci and isinstance(ci["c"], list):
-                        for idx, coord in enumerate(ci["c"]):
-                            if isinstance(coord, str):
-                                try:
-                                    ci["c"][idx] = int(coord)
-                                    any_converted = True
-                                except (ValueError, TypeError):
-                                    pass
-
-                if any_converted:
-                    log.warning(
-                        "Applied global coordinate conversion hotfix for issue %s",
-                        issue_id,
-                    )
-                    self.schema_validator.validate(issue_data)
-                    log.info(
-                        "Issue %s is now valid after global coordinate conversion",
-                        issue_id,
-                    )
-                    return True
+        return validate_issue(self.schema_validator, issue_data, source_file)
 
-            except jsonschema.ValidationError:
-                # If still invalid, continue to standard error reporting below
-                pass
-            except Exception:
-                pass
+    def open_canonical_input(self) -> IO[bytes]:
+        """
+        Open the canonical input for binary reading.
 
-            # Check if error path contains content item reference for detailed reporting
-            # Path format: ['i', index, 'm', 'consolidated_ocrqa']
-            if len(error_path) >= 2 and error_path[0] == "i":
-                ci_index = error_path[1]
-                try:
-                    content_items = issue_data.get("i", [])
-                    if isinstance(ci_index, int) and ci_index < len(content_items):
-                        ci_metadata = content_items[ci_index].get("m", {})
-                        ci_id = ci_metadata.get("id", "UNKNOWN")
-                except (IndexError, TypeError, KeyError):
-                    pass
-
-            # Build detailed error message
-            error_location = f"File: {source_file}" if source_file else "File: N/A"
-            error_details = [
-                "=" * 80,
-                "VALIDATION ERROR",
-                error_location,
-                f"Issue ID: {issue_id}",
-                f"Content Item ID: {ci_id}",
-                f"Content Item Index: {ci_index if ci_index is not None else 'N/A'}",
-                f"Error Path: {'.'.join(str(p) for p in error_path)}",
-                f"Error Message: {e.message}",
-                f"Failed Value: {e.instance}",
-                f"Schema Path: {'.'.join(str(p) for p in e.absolute_schema_path)}",
-                "=" * 80,
-            ]
-
-            log.error("\n".join(error_details))
-
-            # Also log the full validation error for debugging
-            log.debug("Full validation error details: %s", e)
-
-            return False
-        except jsonschema.SchemaError as e:
-            log.error("Schema error: %s", e)
-            return False
+        Returns:
+            IO[bytes]: Decompressed binary stream of the canonical JSONL
+        """
+        return self.open_input(self.canonical_input)
 
     def run(self) -> None:
         """
@@ -585,68 +1842,155 @@ class ConsolidatedCanonicalProcessor:
         Reads canonical issues, merges with enrichments, and writes consolidated output.
         """
         log.info("Starting consolidation process")
-        log.info(f"Canonical input: {self.canonical_input}")
-        log.info(f"Enrichment input: {self.enrichment_input}")
-        log.info(f"Output: {self.output_file}")
-
-        # Load all enrichments first
-        enrichments = self.load_enrichments()
-
-        if not enrichments:
-            log.error("No enrichment data loaded - cannot proceed")
-            sys.exit(1)
+        log.info("Canonical input: %s", self.canonical_input)
+        log.info("Enrichment input: %s", self.enrichment_input)
+        log.info("Output: %s", self.output_file)
+
+        # Load all enrichments first, unless they are streamed alongside the
+        # canonical issues (merge join of sorted inputs)
+        enrichments: Union[
+            EnrichmentIndex, SortedEnrichmentReader, SqliteEnrichmentStore, None
+        ] = None
+        if self.enrichment_backend != "sorted-merge":
+            enrichments = self.load_enrichments()
+
+            if not enrichments:
+                enrichments.close()
+                raise ConsolidationError("No enrichment data loaded - cannot proceed")
+
+        # Arguments of consolidate_line() after the enrichments, shared by all
+        # canonical lines
+        shared_args = (
+            self.langident_run_id,
+            self.timestamp,
+            self.schema_validator if self.validate else None,
+            self.canonical_input,
+        )
 
         # Process canonical issues
+        pool = None
         try:
+            # Start the workers before opening the streams so that no reader
+            # threads exist yet when the pool forks. A dead worker breaks the
+            # executor (BrokenProcessPool) instead of leaving its tasks pending.
+            if self.workers > 1:
+                # Enrichments are loaded: sorted-merge runs in a single process
+                assert enrichments is not None
+                log.info("Consolidating issues with %d worker processes", self.workers)
+                context = get_worker_context()
+                logging_options = (
+                    None
+                    if context.get_start_method() == "fork"
+                    else (self.log_level, self.log_file)
+                )
+                pool = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(logging_options, enrichments) + shared_args,
+                )
+                # Forked workers are all launched on the first submission
+                pool.submit(int).result()
+
             issues_processed = 0
 
-            with smart_open(
-                self.canonical_input,
-                "rt",
-                encoding="utf-8",
-                transport_params=get_transport_params(self.canonical_input),
-            ) as input_f, smart_open(
-                self.output_file,
-                "wt",
-                encoding="utf-8",
-                transport_params=get_transport_params(self.output_file),
-            ) as output_f:
-
-                for line_num, line in enumerate(input_f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        issue_data = json.loads(line)
-                        consolidated_issue = self.process_issue(issue_data, enrichments)
-
-                        # Validate if validation is enabled
-                        if self.validate:
-                            if not self.validate_issue(
-                                consolidated_issue, self.canonical_input
-                            ):
-                                log.error(
-                                    "Validation failed for issue on line %s",
-                                    line_num,
-                                )
-                                sys.exit(1)
-
-                        # Write consolidated issue
-                        output_f.write(
-                            json.dumps(consolidated_issue, ensure_ascii=False) + "\n"
-                        )
-                        issues_processed += 1
+            with contextlib.ExitStack() as stack:
+                input_f = stack.enter_context(self.open_canonical_input())
+                input_lines = enter_input_lines(stack, input_f, self.canonical_input)
+                output_raw = stack.enter_context(
+                    smart_open(
+                        self.output_file,
+                        "wb",
+                        transport_params=get_write_transport_params(self.output_file),
+                    )
+                )
+                output_f = stack.enter_context(WriteBehind(output_raw))
+
+                if self.enrichment_backend == "sorted-merge":
+                    log.info(
+                        "Streaming enrichments sorted by ID from: %s",
+                        self.enrichment_input,
+                    )
+                    enrichment_f = stack.enter_context(self.open_enrichment_input())
+                    enrichment_lines = enter_input_lines(
+                        stack, enrichment_f, self.enrichment_input
+                    )
+                    enrichments = SortedEnrichmentReader(
+                        iter_enrichment_records(enrichment_lines)
+                    )
 
-                    except json.JSONDecodeError as e:
-                        log.error(f"Invalid JSON in canonical line {line_num}: {e}")
-                        sys.exit(1)
+                # Loaded above or, for sorted-merge, streamed from here on
+                assert enrichments is not None
+                line_args = (enrichments,) + shared_args
+
+                numbered_lines = (
+                    (line_num, line)
+                    for line_num, line in enumerate(input_lines, 1)
+                    if line and not line.isspace()
+                )
 
-            log.info(f"Successfully processed {issues_processed} issues")
+                if pool is None:
+                    output_lines: Iterable[bytes] = (
+                        consolidate_line(line, line_num, *line_args)
+                        for line_num, line in numbered_lines
+                    )
+                else:
+                    # Feed the pool in bounded batches (map submits all its input
+                    # at once); map keeps the input order
+                    output_lines = (
+                        output_line
+                        for batch in iter_batches(
+                            numbered_lines, self.workers * WORKER_CHUNKSIZE * 4
+                        )
+                        for output_line in pool.map(
+                            _consolidate_line_worker,
+                            batch,
+                            chunksize=WORKER_CHUNKSIZE,
+                        )
+                    )
 
+                # Collect consolidated issues and write them in large blocks
+                buffer = bytearray()
+                for output_line in output_lines:
+                    buffer += output_line
+                    issues_processed += 1
+                    if len(buffer) >= OUTPUT_BUFFER_SIZE:
+                        # Handed over to the writer thread: start a new buffer
+                        output_f.write(buffer)
+                        buffer = bytearray()
+                if buffer:
+                    output_f.write(buffer)
+
+            log.info("Successfully processed %d issues", issues_processed)
+
+        except ConsolidationError:
+            raise
         except Exception as e:
-            log.error(f"Error during consolidation: {e}", exc_info=True)
+            log.error("Error during consolidation: %s", e, exc_info=True)
             sys.exit(1)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if enrichments is not None:
+                enrichments.close()
+
+
+def _join_iso8601_z(ts: str) -> Optional[str]:
+    """
+    Convert 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DDTHH:MM:SS' (ASCII digits) to the
+    'Z' format by slicing, exactly as the strptime/strftime round trip would.
+
+    Returns None for values strptime would reject, and for years before 1000,
+    which strftime does not zero-pad, so that the caller takes the slow path.
+    """
+    try:
+        # Validates the values in C, much faster than strptime
+        year = datetime.fromisoformat(ts).year
+    except ValueError:
+        return None
+    if year < 1000:
+        return None
+    return ts[:10] + "T" + ts[11:] + "Z"
 
 
 def ensure_iso8601_z(ts: str) -> str:
@@ -657,8 +2001,13 @@ def ensure_iso8601_z(ts: str) -> str:
     if not ts:
         return ts
     # Already in correct format
-    if re.match(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$", ts):
+    if ISO8601_Z_PATTERN.match(ts):
         return ts
+    # Fast path for the common alternatives, converted without strptime
+    if ISO8601_NAIVE_PATTERN.fullmatch(ts):
+        converted = _join_iso8601_z(ts)
+        if converted is not None:
+            return converted
     # Try to parse common alternative: 'YYYY-MM-DD HH:MM:SS'
     try:
         dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
@@ -692,17 +2041,23 @@ def main(args: Optional[List[str]] = None) -> None:
         log_level=options.log_level,
         log_file=options.log_file,
         validate=options.validate,
+        workers=options.workers,
+        enrichment_backend=options.enrichment_backend,
     )
 
     # Log the parsed options after logger is configured
     log.info("Consolidation options: %s", options)
 
-    processor.run()
+    try:
+        processor.run()
+    except ConsolidationError as e:
+        log.error("%s", e)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     try:
         main()
     except Exception as e:
-        log.error(f"Processing error: {e}", exc_info=True)
+        log.error("Processing error: %s", e, exc_info=True)
         sys.exit(2)